@@ -32,6 +32,7 @@ class Settings(BaseSettings):
     OCR_DEFAULT_ENGINE: str = "easyocr"  # easyocr, tesseract
     OCR_DEFAULT_LANGUAGE: str = "jpn+eng"
     OCR_GPU_ENABLED: bool = True
+    OCR_BATCH_SIZE: int = 8  # EasyOCR recognizer batch size (text boxes per forward pass)
 
     # Embedding settings (model names are managed via DB system_settings, fetched via internal API)
     OLLAMA_BASE_URL: str = "http://localhost:11434"
@@ -0,0 +1,15 @@
+"""File name helpers shared by the upload routers."""
+import re
+from pathlib import Path
+from typing import Optional
+
+# Characters not allowed in stored upload filenames (\w keeps non-ASCII letters)
+_UNSAFE_FILENAME_RE = re.compile(r"[^\w.\-() ]")
+
+
+def safe_upload_filename(filename: Optional[str]) -> str:
+    """Return a filesystem-safe basename for storing an uploaded file."""
+    name = _UNSAFE_FILENAME_RE.sub("_", Path(filename or "").name).strip()
+    if not name or name in (".", ".."):
+        return "document.pdf"
+    return name
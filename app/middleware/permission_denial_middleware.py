@@ -48,12 +48,12 @@ class PermissionDenialMiddleware(BaseHTTPMiddleware):
         if response.status_code != 403:
             return response
 
-        body_bytes = b""
+        chunks = []
         async for chunk in response.body_iterator:
             if isinstance(chunk, str):
-                body_bytes += chunk.encode("utf-8")
-            else:
-                body_bytes += chunk
+                chunk = chunk.encode("utf-8")
+            chunks.append(chunk)
+        body_bytes = b"".join(chunks)
 
         permission = _extract_permission(body_bytes.decode("utf-8", errors="replace"))
 
@@ -3,19 +3,20 @@
 Authenticated via X-Internal-Secret header instead of JWT.
 Mirrors the public endpoints in process.py and ocr.py.
 """
-import json
 import logging
 import asyncio
 from datetime import datetime, timezone
 from pathlib import Path
 from typing import Optional
 from uuid import uuid4
+from urllib.parse import urlencode
 
 from fastapi import APIRouter, Depends, Header, HTTPException, status
 from fastapi import UploadFile, File, Form, Query, Body
 from fastapi.responses import StreamingResponse
 
 from app.core.config import settings
+from app.core.files import safe_upload_filename
 from app.schemas.documents import (
     DocumentProcessResponse,
     CropImageRequest,
@@ -66,7 +67,7 @@ async def internal_process_document(
         storage_path = Path(settings.STORAGE_BASE_PATH) / "pending" / task_id
         storage_path.mkdir(parents=True, exist_ok=True)
 
-        file_path = storage_path / (file.filename or "document.pdf")
+        file_path = storage_path / safe_upload_filename(file.filename)
         content = await file.read()
         with open(file_path, "wb") as f:
             f.write(content)
@@ -133,7 +134,7 @@ async def internal_process_document_async(
         storage_path = Path(settings.STORAGE_BASE_PATH) / "pending" / task_id
         storage_path.mkdir(parents=True, exist_ok=True)
 
-        file_path = storage_path / (file.filename or "document.pdf")
+        file_path = storage_path / safe_upload_filename(file.filename)
         content = await file.read()
         with open(file_path, "wb") as f:
             f.write(content)
@@ -191,7 +192,12 @@ async def internal_get_ocr_metadata(
     ),
 ):
     """Get OCR metadata for a processed document (internal)."""
-    from app.routers.ocr import resolve_document_path
+    from app.routers.ocr import (
+        EDITED_METADATA_FILE_NAME,
+        find_metadata_file,
+        read_metadata_file,
+        resolve_document_path,
+    )
 
     try:
         doc_path = resolve_document_path(document_id, processing_path)
@@ -200,32 +206,18 @@ async def internal_get_ocr_metadata(
                 status_code=404, detail=f"Document not found: {document_id}"
             )
 
-        metadata_file = None
-        for name in [
-            "metadata_hierarchy.json",
-            "metadata.json",
-            "ocr_metadata.json",
-        ]:
-            candidate = doc_path / name
-            if candidate.exists():
-                metadata_file = candidate
-                break
+        metadata_file = find_metadata_file(doc_path)
 
         if not metadata_file:
             raise HTTPException(
                 status_code=404, detail="Metadata not found for document"
             )
 
-        with open(metadata_file, "r", encoding="utf-8") as f:
-            metadata = json.load(f)
-
-        edited_file = doc_path / "metadata_hierarchy_edited.json"
+        edited_file = doc_path / EDITED_METADATA_FILE_NAME
         is_edited = edited_file.exists()
         editing_status = "edited" if is_edited else "unedited"
 
-        if is_edited:
-            with open(edited_file, "r", encoding="utf-8") as f:
-                metadata = json.load(f)
+        metadata = read_metadata_file(edited_file if is_edited else metadata_file)
 
         return OCRMetadataResponse(
             metadata=metadata,
@@ -257,7 +249,11 @@ async def internal_update_ocr_metadata(
     ),
 ):
     """Update OCR metadata for a document (internal)."""
-    from app.routers.ocr import resolve_document_path
+    from app.routers.ocr import (
+        EDITED_METADATA_FILE_NAME,
+        resolve_document_path,
+        write_metadata_file,
+    )
 
     try:
         doc_path = resolve_document_path(document_id, processing_path)
@@ -266,9 +262,8 @@ async def internal_update_ocr_metadata(
                 status_code=404, detail=f"Document not found: {document_id}"
             )
 
-        edited_file = doc_path / "metadata_hierarchy_edited.json"
-        with open(edited_file, "w", encoding="utf-8") as f:
-            json.dump(request.metadata, f, ensure_ascii=False, indent=2)
+        edited_file = doc_path / EDITED_METADATA_FILE_NAME
+        write_metadata_file(edited_file, request.metadata)
 
         return OCRMetadataUpdateResponse(
             success=True,
@@ -298,31 +293,19 @@ async def internal_ocr_region(
     ),
 ):
     """Perform OCR on a specific region of a page (internal)."""
-    from app.routers.ocr import resolve_document_path
-    from app.services.processor import RegionOCRProcessor
+    from app.routers.ocr import find_page_image, resolve_document_path
+    from app.services.processor import get_region_ocr_processor
 
     try:
         doc_path = resolve_document_path(document_id, processing_path)
-        page_image = None
-        for pattern in [
-            f"images/page_{page_number}_full.png",
-            f"page_{page_number}_full.png",
-            f"page_{page_number:03d}.png",
-            f"page_{page_number}.png",
-            f"images/page_{page_number:03d}.png",
-        ]:
-            candidate = doc_path / pattern
-            if candidate.exists():
-                page_image = candidate
-                break
-
+        page_image = find_page_image(doc_path, page_number)
         if not page_image:
             raise HTTPException(
                 status_code=404,
                 detail=f"Page image not found for page {page_number}",
             )
 
-        ocr_processor = RegionOCRProcessor()
+        ocr_processor = get_region_ocr_processor()
         result = ocr_processor.process_region_ocr(
             image_path=str(page_image),
             x=x,
@@ -358,7 +341,7 @@ async def internal_crop_image(
     ),
 ):
     """Crop a region from a document page image (internal)."""
-    from app.routers.ocr import resolve_document_path
+    from app.routers.ocr import find_page_image, resolve_document_path
     from app.services.processor import ImageCropper
 
     try:
@@ -368,19 +351,7 @@ async def internal_crop_image(
                 status_code=404, detail=f"Document not found: {document_id}"
             )
 
-        page_image = None
-        for pattern in [
-            f"images/page_{page_number}_full.png",
-            f"page_{page_number}_full.png",
-            f"page_{page_number:03d}.png",
-            f"page_{page_number}.png",
-            f"images/page_{page_number:03d}.png",
-        ]:
-            candidate = doc_path / pattern
-            if candidate.exists():
-                page_image = candidate
-                break
-
+        page_image = find_page_image(doc_path, page_number)
         if not page_image:
             raise HTTPException(
                 status_code=404,
@@ -417,12 +388,10 @@ async def internal_crop_image(
                 local_cropped_path = doc_path / result["image_path"]
                 object_key = f"{prefix}/{result['image_path']}"
                 minio_client.upload_file(str(local_cropped_path), bucket, object_key)
-                logger.info(f"Uploaded cropped image to MinIO: {bucket}/{object_key}")
+                logger.info("Uploaded cropped image to MinIO: %s/%s", bucket, object_key)
             except Exception as e:
                 logger.error(f"Failed to upload cropped image to MinIO: {e}")
 
-        from urllib.parse import urlencode
-
         base_url = f"/api/doc/ocr/images/{document_id}/{result['image_path']}"
         if processing_path:
             base_url = f"{base_url}?{urlencode({'processing_path': processing_path})}"
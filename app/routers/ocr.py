@@ -1,11 +1,17 @@
 """OCR router - OCRメタデータ、画像クロッピング操作."""
 from fastapi import APIRouter, HTTPException, Depends, Body, Query
 from fastapi.responses import FileResponse
+from concurrent.futures import ThreadPoolExecutor
 from pathlib import Path
 from uuid import UUID
+import json
 import logging
+import shutil
 import tempfile
 from typing import Dict, Any, Optional
+from urllib.parse import urlencode
+
+import orjson
 
 from app.core.security import get_current_user, require_admin
 from app.core.config import settings
@@ -26,6 +32,35 @@ router = APIRouter()
 # Cache for MinIO downloaded files to avoid re-downloading
 _minio_cache: Dict[str, Path] = {}
 
+# Max parallel object downloads when materializing a MinIO prefix locally
+MINIO_DOWNLOAD_WORKERS = 8
+
+# Page image naming conventions, in lookup priority order
+PAGE_IMAGE_PATTERNS = (
+    "images/page_{page}_full.png",
+    "page_{page}_full.png",
+    "page_{page:03d}.png",
+    "page_{page}.png",
+    "images/page_{page:03d}.png",
+)
+
+# Metadata file names, in lookup priority order
+METADATA_FILE_NAMES = (
+    "metadata_hierarchy.json",
+    "metadata.json",
+    "ocr_metadata.json",
+)
+EDITED_METADATA_FILE_NAME = "metadata_hierarchy_edited.json"
+
+# Served image media types by file suffix
+IMAGE_MEDIA_TYPES = {
+    ".png": "image/png",
+    ".jpg": "image/jpeg",
+    ".jpeg": "image/jpeg",
+    ".gif": "image/gif",
+    ".webp": "image/webp",
+}
+
 
 def resolve_document_path(
     document_id: str,
@@ -63,6 +98,91 @@ def resolve_document_path(
     return Path(settings.STORAGE_BASE_PATH) / document_id
 
 
+def find_page_image(doc_path: Path, page_number: int) -> Optional[Path]:
+    """
+    Find the rendered image for a page using the known naming conventions.
+
+    Args:
+        doc_path: Resolved document directory
+        page_number: Page number (1-based)
+
+    Returns:
+        Path to the first existing page image, or None if not found
+    """
+    for pattern in PAGE_IMAGE_PATTERNS:
+        candidate = doc_path / pattern.format(page=page_number)
+        if candidate.exists():
+            return candidate
+    return None
+
+
+def find_metadata_file(doc_path: Path) -> Optional[Path]:
+    """
+    Find the original metadata file for a document.
+
+    Args:
+        doc_path: Resolved document directory
+
+    Returns:
+        Path to the first existing metadata file, or None if not found
+    """
+    for name in METADATA_FILE_NAMES:
+        candidate = doc_path / name
+        if candidate.exists():
+            return candidate
+    return None
+
+
+def read_metadata_file(path: Path) -> Dict[str, Any]:
+    """
+    Read a UTF-8 JSON metadata file.
+
+    Parses the raw bytes with orjson (no intermediate str decode). Content
+    orjson rejects (e.g. NaN/Infinity written by the stdlib) is parsed with
+    the stdlib json module.
+
+    Args:
+        path: Metadata file path
+
+    Returns:
+        Parsed metadata content
+    """
+    with open(path, "rb") as f:
+        data = f.read()
+    metadata: Dict[str, Any]
+    try:
+        metadata = orjson.loads(data)
+    except orjson.JSONDecodeError:
+        metadata = json.loads(data.decode("utf-8"))
+    return metadata
+
+
+def write_metadata_file(path: Path, metadata: Dict[str, Any]) -> None:
+    """
+    Write metadata as UTF-8 JSON with 2-space indentation.
+
+    Serializes with orjson straight to UTF-8 bytes. Content orjson cannot
+    serialize (e.g. integers beyond 64 bits) is written with the stdlib
+    json module.
+
+    Note: unlike the stdlib, orjson writes NaN/Infinity floats as null.
+
+    Args:
+        path: Destination file path
+        metadata: Metadata content to serialize
+    """
+    # Serialize before opening so a rejected payload leaves no partial file
+    try:
+        data = orjson.dumps(metadata, option=orjson.OPT_INDENT_2)
+    except TypeError:
+        with open(path, "w", encoding="utf-8") as f:
+            json.dump(metadata, f, ensure_ascii=False, indent=2)
+        return
+
+    with open(path, "wb") as f:
+        f.write(data)
+
+
 def _resolve_minio_path(document_id: str, minio_path: str) -> Path:
     """
     Download files from MinIO and return local cache path.
@@ -78,40 +198,49 @@ def _resolve_minio_path(document_id: str, minio_path: str) -> Path:
 
     # Check cache first
     cache_key = f"{document_id}:{minio_path}"
-    if cache_key in _minio_cache:
-        cached_path = _minio_cache[cache_key]
-        if cached_path.exists():
-            logger.debug(f"Using cached MinIO download: {cached_path}")
-            return cached_path
+    cached_path = _minio_cache.get(cache_key)
+    if cached_path is not None and cached_path.exists():
+        logger.debug("Using cached MinIO download: %s", cached_path)
+        return cached_path
 
     try:
         from app.services.storage import get_minio_client, parse_minio_path
 
-        logger.info(f"Downloading from MinIO: {minio_path}")
+        logger.info("Downloading from MinIO: %s", minio_path)
         bucket, prefix = parse_minio_path(minio_path)
         minio_client = get_minio_client()
 
         # Create temp directory for this document
         temp_dir = Path(tempfile.mkdtemp(prefix=f"api_doc_{document_id[:8]}_"))
 
-        # List and download all files with this prefix
+        # List all files with this prefix and prepare local destinations
         objects = minio_client.list_objects(bucket, prefix)
-        downloaded_count = 0
+        downloads = []
+        prefix_len = len(prefix)
 
         for obj in objects:
             object_key = obj["Key"]
             # Get relative path from prefix
-            relative_path = object_key[len(prefix):].lstrip("/")
+            relative_path = object_key[prefix_len:].lstrip("/")
             if not relative_path:
                 continue
 
             local_file_path = temp_dir / relative_path
             local_file_path.parent.mkdir(parents=True, exist_ok=True)
+            downloads.append((object_key, str(local_file_path)))
 
-            minio_client.download_file(bucket, object_key, str(local_file_path))
-            downloaded_count += 1
+        # Download concurrently (network-bound; the boto3 client is thread-safe)
+        if downloads:
+            with ThreadPoolExecutor(
+                max_workers=min(MINIO_DOWNLOAD_WORKERS, len(downloads))
+            ) as executor:
+                list(executor.map(
+                    lambda job: minio_client.download_file(bucket, *job),
+                    downloads,
+                ))
+        downloaded_count = len(downloads)
 
-        logger.info(f"Downloaded {downloaded_count} files from MinIO to {temp_dir}")
+        logger.info("Downloaded %d files from MinIO to %s", downloaded_count, temp_dir)
 
         # Cache the result
         _minio_cache[cache_key] = temp_dir
@@ -154,19 +283,7 @@ async def crop_image(
             )
 
         # Find page image (try common naming conventions)
-        page_image = None
-        for pattern in [
-            f"images/page_{page_number}_full.png",
-            f"page_{page_number}_full.png",
-            f"page_{page_number:03d}.png",
-            f"page_{page_number}.png",
-            f"images/page_{page_number:03d}.png",
-        ]:
-            candidate = doc_path / pattern
-            if candidate.exists():
-                page_image = candidate
-                break
-
+        page_image = find_page_image(doc_path, page_number)
         if not page_image:
             raise HTTPException(
                 status_code=404,
@@ -212,13 +329,12 @@ async def crop_image(
                     bucket,
                     object_key,
                 )
-                logger.info(f"Uploaded cropped image to MinIO: {bucket}/{object_key}")
+                logger.info("Uploaded cropped image to MinIO: %s/%s", bucket, object_key)
             except Exception as e:
                 logger.error(f"Failed to upload cropped image to MinIO: {e}")
                 # Continue anyway - image is available locally
 
         # Build download URL with processing_path if using MinIO
-        from urllib.parse import urlencode
         base_url = f"/api/doc/ocr/images/{document_id}/{result['image_path']}"
         if processing_path:
             base_url = f"{base_url}?{urlencode({'processing_path': processing_path})}"
@@ -261,9 +377,15 @@ async def get_image(
     - Generated images
     """
     try:
+        # Reject obviously escaping paths before resolving the document
+        # (which may trigger a MinIO download)
+        requested = Path(path)
+        if requested.is_absolute() or ".." in requested.parts:
+            raise HTTPException(status_code=403, detail="Access denied")
+
         # Build full path
         doc_base = resolve_document_path(document_id, processing_path)
-        full_path = doc_base / path
+        full_path = doc_base / requested
         try:
             full_path.resolve().relative_to(doc_base.resolve())
         except ValueError:
@@ -273,15 +395,9 @@ async def get_image(
             raise HTTPException(status_code=404, detail="Image not found")
 
         # Determine media type
-        suffix = full_path.suffix.lower()
-        media_types = {
-            ".png": "image/png",
-            ".jpg": "image/jpeg",
-            ".jpeg": "image/jpeg",
-            ".gif": "image/gif",
-            ".webp": "image/webp",
-        }
-        media_type = media_types.get(suffix, "application/octet-stream")
+        media_type = IMAGE_MEDIA_TYPES.get(
+            full_path.suffix.lower(), "application/octet-stream"
+        )
 
         return FileResponse(full_path, media_type=media_type)
 
@@ -315,48 +431,32 @@ async def get_ocr_metadata(
     Otherwise, falls back to {STORAGE_BASE_PATH}/{document_id}.
     """
     try:
-        import json
-
         doc_path = resolve_document_path(document_id, processing_path)
-        logger.debug(f"Resolved document path: {doc_path}")
+        logger.debug("Resolved document path: %s", doc_path)
 
         if not doc_path.exists():
             logger.warning(
-                f"Document path not found: {doc_path}, "
-                f"document_id={document_id}, processing_path={processing_path}"
+                "Document path not found: %s, document_id=%s, processing_path=%s",
+                doc_path, document_id, processing_path,
             )
             raise HTTPException(
                 status_code=404, detail=f"Document not found: {document_id}"
             )
 
         # Try to find metadata file
-        metadata_file = None
-        for name in [
-            "metadata_hierarchy.json",
-            "metadata.json",
-            "ocr_metadata.json",
-        ]:
-            candidate = doc_path / name
-            if candidate.exists():
-                metadata_file = candidate
-                break
+        metadata_file = find_metadata_file(doc_path)
 
         if not metadata_file:
             raise HTTPException(
                 status_code=404, detail="Metadata not found for document"
             )
 
-        with open(metadata_file, "r", encoding="utf-8") as f:
-            metadata = json.load(f)
-
-        # Check for edited metadata
-        edited_file = doc_path / "metadata_hierarchy_edited.json"
+        # Edited metadata supersedes the original, so only parse the file returned
+        edited_file = doc_path / EDITED_METADATA_FILE_NAME
         is_edited = edited_file.exists()
         editing_status = "edited" if is_edited else "unedited"
 
-        if is_edited:
-            with open(edited_file, "r", encoding="utf-8") as f:
-                metadata = json.load(f)
+        metadata = read_metadata_file(edited_file if is_edited else metadata_file)
 
         return OCRMetadataResponse(
             metadata=metadata,
@@ -392,8 +492,6 @@ async def update_ocr_metadata(
     Saves edited metadata to a separate file to preserve original.
     """
     try:
-        import json
-
         doc_path = resolve_document_path(document_id, processing_path)
         if not doc_path.exists():
             raise HTTPException(
@@ -401,9 +499,8 @@ async def update_ocr_metadata(
             )
 
         # Save edited metadata
-        edited_file = doc_path / "metadata_hierarchy_edited.json"
-        with open(edited_file, "w", encoding="utf-8") as f:
-            json.dump(request.metadata, f, ensure_ascii=False, indent=2)
+        edited_file = doc_path / EDITED_METADATA_FILE_NAME
+        write_metadata_file(edited_file, request.metadata)
 
         return OCRMetadataUpdateResponse(
             success=True,
@@ -435,8 +532,6 @@ async def save_cropped_image(
     Moves the image from temporary location to permanent storage.
     """
     try:
-        import shutil
-
         doc_path = resolve_document_path(document_id, processing_path)
         if not doc_path.exists():
             raise HTTPException(
@@ -456,7 +551,7 @@ async def save_cropped_image(
         dest_path = dest_dir / f"{request.rectangleId}.png"
 
         # Copy file
-        shutil.copy2(temp_path, dest_path)
+        shutil.copyfile(temp_path, dest_path)
 
         return SaveCroppedImageResponse(
             success=True,
@@ -494,23 +589,11 @@ async def ocr_region(
     Uses EasyOCR or Tesseract based on configuration.
     """
     try:
-        from app.services.processor import RegionOCRProcessor
+        from app.services.processor import get_region_ocr_processor
 
         # Find page image
         doc_path = resolve_document_path(document_id, processing_path)
-        page_image = None
-        for pattern in [
-            f"images/page_{page_number}_full.png",
-            f"page_{page_number}_full.png",
-            f"page_{page_number:03d}.png",
-            f"page_{page_number}.png",
-            f"images/page_{page_number:03d}.png",
-        ]:
-            candidate = doc_path / pattern
-            if candidate.exists():
-                page_image = candidate
-                break
-
+        page_image = find_page_image(doc_path, page_number)
         if not page_image:
             raise HTTPException(
                 status_code=404,
@@ -518,7 +601,7 @@ async def ocr_region(
             )
 
         # Perform OCR
-        ocr_processor = RegionOCRProcessor()
+        ocr_processor = get_region_ocr_processor()
         result = ocr_processor.process_region_ocr(
             image_path=str(page_image),
             x=x,
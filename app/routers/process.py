@@ -9,9 +9,14 @@ from uuid import uuid4
 import logging
 import asyncio
 import json
+import time
 from typing import Optional
 from datetime import datetime, timezone
 
+import orjson
+
+from app.core.config import settings
+from app.core.files import safe_upload_filename
 from app.core.security import get_current_user, require_admin
 from app.schemas.documents import (
     DocumentProcessResponse,
@@ -23,6 +28,15 @@ logger = logging.getLogger(__name__)
 router = APIRouter()
 
 
+def _dumps_event(data: dict) -> str:
+    """Serialize an SSE event payload to a JSON string with orjson."""
+    try:
+        return orjson.dumps(data).decode("utf-8")
+    except TypeError:
+        # Integers beyond 64 bits, non-str dict keys, etc.
+        return json.dumps(data)
+
+
 @router.get("/status", response_model=DocumentProcessStatus)
 async def get_processing_status(_: dict = Depends(require_admin)):
     """Get document processing service status.
@@ -88,7 +102,6 @@ async def process_document(
     For fully async processing, use /process/async endpoint or set wait=False.
     """
     try:
-        from app.core.config import settings
         from app.tasks.celery_app import celery_app
 
         # Save file to persistent storage
@@ -96,7 +109,7 @@ async def process_document(
         storage_path = Path(settings.STORAGE_BASE_PATH) / "pending" / task_id
         storage_path.mkdir(parents=True, exist_ok=True)
 
-        file_path = storage_path / (file.filename or "document.pdf")
+        file_path = storage_path / safe_upload_filename(file.filename)
         content = await file.read()
         with open(file_path, "wb") as f:
             f.write(content)
@@ -175,7 +188,6 @@ async def process_document_async(
     Use /process/status/{task_id} to check task status.
     """
     try:
-        from app.core.config import settings
         from app.tasks.celery_app import celery_app
 
         # Save file to persistent storage
@@ -183,7 +195,7 @@ async def process_document_async(
         storage_path = Path(settings.STORAGE_BASE_PATH) / "pending" / task_id
         storage_path.mkdir(parents=True, exist_ok=True)
 
-        file_path = storage_path / (file.filename or "document.pdf")
+        file_path = storage_path / safe_upload_filename(file.filename)
         content = await file.read()
         with open(file_path, "wb") as f:
             f.write(content)
@@ -258,25 +270,27 @@ async def stream_task_status(
     """
     async def event_generator():
         """Progress event generator that yields SSE-formatted messages"""
-        from celery.result import AsyncResult
         from app.tasks.celery_app import celery_app
 
         last_status = None
         terminal_states = ["SUCCESS", "FAILURE", "REVOKED"]
         heartbeat_interval = 2
-        seconds_since_last_event = 0
+        last_event_at = time.monotonic()
 
         try:
-            logger.info(f"SSE stream started: task_id={task_id}")
+            logger.info("SSE stream started: task_id=%s", task_id)
 
             while True:
-                result = AsyncResult(task_id, app=celery_app)
-                current_status = result.status
+                # Fetch status and result/info in a single backend round trip
+                task_meta = celery_app.backend.get_task_meta(task_id)
+                current_status = task_meta["status"]
+                task_info = task_meta.get("result")
+                now = time.monotonic()
 
                 # Determine if we should send an event
                 has_changed = current_status != last_status
                 is_first_event = last_status is None
-                is_heartbeat_time = seconds_since_last_event >= heartbeat_interval
+                is_heartbeat_time = now - last_event_at >= heartbeat_interval
 
                 if has_changed or is_first_event or is_heartbeat_time:
                     # Build progress data
@@ -287,30 +301,25 @@ async def stream_task_status(
                     }
 
                     # Add result if task is ready
-                    if result.ready():
-                        try:
-                            progress_data["result"] = result.result
-                        except Exception:
-                            progress_data["result"] = None
+                    if current_status in terminal_states:
+                        progress_data["result"] = task_info
 
                     # Add task info if available
-                    if hasattr(result, "info") and result.info:
-                        progress_data["info"] = result.info
+                    if task_info:
+                        progress_data["info"] = task_info
 
                     # Send SSE event
                     event_type = "heartbeat" if (is_heartbeat_time and not has_changed) else "progress"
-                    logger.debug(f"SSE {event_type}: task_id={task_id}, status={current_status}")
-                    yield f"data: {json.dumps(progress_data)}\n\n"
+                    logger.debug("SSE %s: task_id=%s, status=%s", event_type, task_id, current_status)
+                    yield f"data: {_dumps_event(progress_data)}\n\n"
 
                     # Update tracking
                     last_status = current_status
-                    seconds_since_last_event = 0
-                else:
-                    seconds_since_last_event += 1
+                    last_event_at = now
 
                 # Check for terminal state
                 if current_status in terminal_states:
-                    logger.info(f"SSE task finished: task_id={task_id}, status={current_status}")
+                    logger.info("SSE task finished: task_id=%s, status=%s", task_id, current_status)
                     break
 
                 # Wait before next check
@@ -9,23 +9,40 @@ Heavy document processing (OCR, layout extraction, hierarchical conversion)
 is handled by celery-doc worker service.
 
 Usage:
-    from app.services.processor import ImageCropper, RegionOCRProcessor
+    from app.services.processor import ImageCropper, get_region_ocr_processor
 
     # Crop an image region
     cropper = ImageCropper()
     result = cropper.crop_image(image_path, x, y, width, height)
 
     # OCR a specific region
-    ocr = RegionOCRProcessor()
-    text = ocr.process_region(image_path, region_coords)
+    ocr = get_region_ocr_processor()
+    result = ocr.process_region_ocr(image_path, x, y, width, height)
 """
 
+from typing import TYPE_CHECKING, Any
+
 from .image_cropper import ImageCropper
-from .region_ocr_processor import RegionOCRProcessor
+
+if TYPE_CHECKING:
+    from .region_ocr_processor import RegionOCRProcessor, get_region_ocr_processor
+
+# region_ocr_processor imports torch/easyocr at module load, so it is only
+# imported on first access to keep crop-only callers lightweight
+_LAZY_EXPORTS = {"RegionOCRProcessor", "get_region_ocr_processor"}
+
+
+def __getattr__(name: str) -> Any:
+    if name in _LAZY_EXPORTS:
+        from . import region_ocr_processor
+        return getattr(region_ocr_processor, name)
+    raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
+
 
 __all__ = [
     "ImageCropper",
     "RegionOCRProcessor",
+    "get_region_ocr_processor",
 ]
 
 __version__ = "2.0.0"
@@ -12,6 +12,24 @@ import datetime
 
 logger = logging.getLogger(__name__)
 
+# 切り出し対象の要素タイプ
+CROPPABLE_ELEMENT_TYPES = frozenset({'picture', 'figure', 'caption', 'table'})
+
+# 要素タイプ -> 出力サブディレクトリ（未登録のタイプは 'cropped'）
+_OUTPUT_SUBDIRS = {'figure': 'figures', 'picture': 'figures'}
+
+
+def _xyxy_to_xywh(
+    x1: float, y1: float, x2: float, y2: float, scale_factor: float = 1.0
+) -> Dict[str, float]:
+    """(x1,y1,x2,y2) 形式の座標を (x,y,width,height) 形式のbbox辞書に変換"""
+    return {
+        'x': x1 * scale_factor,
+        'y': y1 * scale_factor,
+        'width': (x2 - x1) * scale_factor,
+        'height': (y2 - y1) * scale_factor
+    }
+
 
 class ImageCropper:
     """画像の切り出し処理を行うクラス"""
@@ -48,7 +66,7 @@ class ImageCropper:
             # 画像を開く
             with Image.open(page_image_path) as image:
                 img_width, img_height = image.size
-                logger.info(f"Source image size: {img_width}x{img_height}")
+                logger.info("Source image size: %dx%d", img_width, img_height)
                 
                 # BBox座標の検証と調整
                 x = max(0, min(bbox['x'], img_width))
@@ -56,7 +74,7 @@ class ImageCropper:
                 width = max(1, min(bbox['width'], img_width - x))
                 height = max(1, min(bbox['height'], img_height - y))
                 
-                logger.info(f"Crop region: x={x}, y={y}, w={width}, h={height}")
+                logger.info("Crop region: x=%s, y=%s, w=%s, h=%s", x, y, width, height)
                 
                 # 切り出し領域を設定
                 crop_box = (int(x), int(y), int(x + width), int(y + height))
@@ -79,8 +97,8 @@ class ImageCropper:
                 file_size = os.path.getsize(output_path)
                 cropped_width, cropped_height = cropped_image.size
                 
-                logger.info(f"Cropped image saved: {output_path}")
-                logger.info(f"Cropped size: {cropped_width}x{cropped_height}, {file_size} bytes")
+                logger.info("Cropped image saved: %s", output_path)
+                logger.info("Cropped size: %dx%d, %d bytes", cropped_width, cropped_height, file_size)
                 
                 return {
                     "success": True,
@@ -98,7 +116,7 @@ class ImageCropper:
                 }
                 
         except Exception as e:
-            logger.error(f"Image cropping failed: {e}")
+            logger.error("Image cropping failed: %s", e)
             return {
                 "success": False,
                 "error": str(e),
@@ -130,10 +148,7 @@ class ImageCropper:
             filename = f"cropped_{timestamp}.png"
         
         # サブディレクトリを決定
-        if element_type and element_type in ['figure', 'picture']:
-            subdir = 'figures'
-        else:
-            subdir = 'cropped'
+        subdir = _OUTPUT_SUBDIRS.get(element_type or '', 'cropped')
         
         return os.path.join(output_dir, subdir, filename)
     
@@ -156,6 +171,7 @@ class ImageCropper:
         """
         results = []
         success_count = 0
+        total_figures = len(figures)
         
         try:
             for figure in figures:
@@ -163,12 +179,12 @@ class ImageCropper:
                 if 'bbox' in figure and isinstance(figure['bbox'], dict):
                     # bbox形式 (x1,y1,x2,y2) -> (x,y,width,height)
                     elem_bbox = figure['bbox']
-                    bbox = {
-                        'x': elem_bbox.get('x1', 0),
-                        'y': elem_bbox.get('y1', 0),
-                        'width': elem_bbox.get('x2', 0) - elem_bbox.get('x1', 0),
-                        'height': elem_bbox.get('y2', 0) - elem_bbox.get('y1', 0)
-                    }
+                    bbox = _xyxy_to_xywh(
+                        elem_bbox.get('x1', 0),
+                        elem_bbox.get('y1', 0),
+                        elem_bbox.get('x2', 0),
+                        elem_bbox.get('y2', 0)
+                    )
                 elif all(k in figure for k in ['x', 'y', 'width', 'height']):
                     # 既に正しい形式
                     bbox = {
@@ -178,7 +194,7 @@ class ImageCropper:
                         'height': figure['height']
                     }
                 else:
-                    logger.warning(f"Invalid figure bbox format: {figure}")
+                    logger.warning("Invalid figure bbox format: %s", figure)
                     continue
                 
                 result = self.crop_region(
@@ -198,12 +214,12 @@ class ImageCropper:
                 results.append(result)
                 
         except Exception as e:
-            logger.error(f"Batch figure cropping failed: {e}")
+            logger.error("Batch figure cropping failed: %s", e)
         
         return {
-            "total_figures": len(figures),
+            "total_figures": total_figures,
             "success_count": success_count,
-            "failed_count": len(figures) - success_count,
+            "failed_count": total_figures - success_count,
             "results": results
         }
     
@@ -229,25 +245,26 @@ class ImageCropper:
         try:
             # 画像要素のみ処理
             element_type = element.get('type', '')
-            if element_type not in ['picture', 'figure', 'caption', 'table']:
+            if element_type not in CROPPABLE_ELEMENT_TYPES:
                 return False
             
             # bbox座標を取得
             bbox_dict = element.get('bbox')
             if not bbox_dict:
-                logger.warning(f"No bbox found for element {element.get('id', 'unknown')}")
+                logger.warning("No bbox found for element %s", element.get('id', 'unknown'))
                 return False
             
             # bbox形式の正規化とスケール適用
             if isinstance(bbox_dict, dict):
                 if all(k in bbox_dict for k in ['x1', 'y1', 'x2', 'y2']):
                     # bbox形式 (x1,y1,x2,y2) -> (x,y,width,height) with scale
-                    bbox = {
-                        'x': bbox_dict['x1'] * scale_factor,
-                        'y': bbox_dict['y1'] * scale_factor, 
-                        'width': (bbox_dict['x2'] - bbox_dict['x1']) * scale_factor,
-                        'height': (bbox_dict['y2'] - bbox_dict['y1']) * scale_factor
-                    }
+                    bbox = _xyxy_to_xywh(
+                        bbox_dict['x1'],
+                        bbox_dict['y1'],
+                        bbox_dict['x2'],
+                        bbox_dict['y2'],
+                        scale_factor
+                    )
                 elif all(k in bbox_dict for k in ['x', 'y', 'width', 'height']):
                     # 既に正しい形式（スケール適用）
                     bbox = {
@@ -257,10 +274,10 @@ class ImageCropper:
                         'height': bbox_dict['height'] * scale_factor
                     }
                 else:
-                    logger.warning(f"Invalid bbox format for element {element.get('id', 'unknown')}: {bbox_dict}")
+                    logger.warning("Invalid bbox format for element %s: %s", element.get('id', 'unknown'), bbox_dict)
                     return False
             else:
-                logger.warning(f"Invalid bbox type for element {element.get('id', 'unknown')}: {type(bbox_dict)}")
+                logger.warning("Invalid bbox type for element %s: %s", element.get('id', 'unknown'), type(bbox_dict))
                 return False
             
             # 画像を切り出し
@@ -284,12 +301,15 @@ class ImageCropper:
                     'file_size': result['file_size']
                 }
                 
-                logger.info(f"Successfully cropped element {element.get('id', 'unknown')}: {result['image_path']}")
+                logger.info("Successfully cropped element %s: %s", element.get('id', 'unknown'), result['image_path'])
                 return True
             else:
-                logger.error(f"Failed to crop element {element.get('id', 'unknown')}: {result.get('error', 'Unknown error')}")
+                logger.error(
+                    "Failed to crop element %s: %s",
+                    element.get('id', 'unknown'), result.get('error', 'Unknown error'),
+                )
                 return False
                 
         except Exception as e:
-            logger.error(f"Exception in crop_single_element for {element.get('id', 'unknown')}: {e}")
+            logger.error("Exception in crop_single_element for %s: %s", element.get('id', 'unknown'), e)
             return False
\ No newline at end of file
@@ -4,9 +4,11 @@ Region OCR Processor
 """
 
 import logging
-import tempfile
+import os
 import subprocess
-from pathlib import Path
+import threading
+from concurrent.futures import ThreadPoolExecutor
+from functools import lru_cache
 from typing import Tuple, Optional, Dict, Any
 from PIL import Image
 import io
@@ -32,13 +34,24 @@ except ImportError:
     EASYOCR_AVAILABLE = False
     logger.warning("EasyOCR not available, falling back to Tesseract only")
 
+# Tesseract subprocess environment: two CLI passes run concurrently,
+# so limit OpenMP to one thread per process to avoid oversubscription
+_TESSERACT_ENV = {**os.environ, "OMP_THREAD_LIMIT": "1"}
+
 
 class RegionOCRProcessor:
     """矩形エリア指定でのOCR処理クラス"""
     
-    def __init__(self):
+    def __init__(self, ocr_batch_size: int = 1, save_debug_crops: bool = False):
+        """
+        Args:
+            ocr_batch_size: EasyOCRの認識器に一度に渡すテキストボックス数
+            save_debug_crops: クロップ画像を/tmpに保存するか（デバッグ用）
+        """
         self.tesseract_available = self._check_tesseract()
-        self.easyocr_reader = None
+        self.easyocr_reader: Any = None
+        self.ocr_batch_size = max(1, ocr_batch_size)
+        self.save_debug_crops = save_debug_crops
         
         # Initialize EasyOCR if available
         if EASYOCR_AVAILABLE:
@@ -88,48 +101,55 @@ class RegionOCRProcessor:
             OCR結果を含む辞書
         """
         try:
-            # 画像の読み込み
-            image = Image.open(image_path)
-            img_width, img_height = image.size
-            
-            # PDF座標系から画像座標系への変換
-            # PDF座標系（左下原点）→ 画像座標系（左上原点）
-            scale_x = img_width / page_width
-            scale_y = img_height / page_height
-            
-            logger.info(f"Image size: {img_width}x{img_height}, Page size: {page_width}x{page_height}")
-            logger.info(f"Scale factors: scale_x={scale_x}, scale_y={scale_y}")
-            
-            # フロントエンド座標をrectangleScale=2.0で補正
-            rectangle_scale = 2.0
-            img_x = int(x * rectangle_scale)
-            img_y = int(y * rectangle_scale)  
-            img_width_crop = int(width * rectangle_scale)
-            img_height_crop = int(height * rectangle_scale)
-            
-            logger.info(f"Frontend coords: ({x}, {y}, {width}, {height})")
-            logger.info(f"Scaled coords: ({img_x}, {img_y}, {img_width_crop}, {img_height_crop})")
-            
-            logger.info(f"Before clipping: img_x={img_x}, img_y={img_y}, img_width_crop={img_width_crop}, img_height_crop={img_height_crop}")
-            
-            # 画像サイズ内にクリップ
-            img_x = max(0, min(img_x, img_width))
-            img_y = max(0, min(img_y, img_height))
-            img_width_crop = max(1, min(img_width_crop, img_width - img_x))
-            img_height_crop = max(1, min(img_height_crop, img_height - img_y))
-            
-            logger.info(f"OCR region - PDF coords: ({x}, {y}, {width}, {height})")
-            logger.info(f"OCR region - Image coords: ({img_x}, {img_y}, {img_width_crop}, {img_height_crop})")
-            
-            # 矩形エリアをクロップ
-            crop_box = (img_x, img_y, img_x + img_width_crop, img_y + img_height_crop)
-            cropped_image = image.crop(crop_box)
+            # 画像の読み込み（クロップ後はファイルハンドルを即座に解放）
+            with Image.open(image_path) as image:
+                img_width, img_height = image.size
+                
+                # PDF座標系から画像座標系への変換
+                # PDF座標系（左下原点）→ 画像座標系（左上原点）
+                scale_x = img_width / page_width
+                scale_y = img_height / page_height
+                
+                logger.debug("Image size: %dx%d, Page size: %sx%s", img_width, img_height, page_width, page_height)
+                logger.debug("Scale factors: scale_x=%s, scale_y=%s", scale_x, scale_y)
+                
+                # フロントエンド座標をrectangleScale=2.0で補正
+                rectangle_scale = 2.0
+                img_x = int(x * rectangle_scale)
+                img_y = int(y * rectangle_scale)  
+                img_width_crop = int(width * rectangle_scale)
+                img_height_crop = int(height * rectangle_scale)
+                
+                logger.debug("Frontend coords: (%s, %s, %s, %s)", x, y, width, height)
+                logger.debug("Scaled coords: (%d, %d, %d, %d)", img_x, img_y, img_width_crop, img_height_crop)
+                
+                logger.debug(
+                    "Before clipping: img_x=%d, img_y=%d, img_width_crop=%d, img_height_crop=%d",
+                    img_x, img_y, img_width_crop, img_height_crop,
+                )
+                
+                # 画像サイズ内にクリップ
+                img_x = max(0, min(img_x, img_width))
+                img_y = max(0, min(img_y, img_height))
+                img_width_crop = max(1, min(img_width_crop, img_width - img_x))
+                img_height_crop = max(1, min(img_height_crop, img_height - img_y))
+                
+                logger.debug("OCR region - PDF coords: (%s, %s, %s, %s)", x, y, width, height)
+                logger.debug(
+                    "OCR region - Image coords: (%d, %d, %d, %d)",
+                    img_x, img_y, img_width_crop, img_height_crop,
+                )
+                
+                # 矩形エリアをクロップ
+                crop_box = (img_x, img_y, img_x + img_width_crop, img_y + img_height_crop)
+                cropped_image = image.crop(crop_box)
             
-            # デバッグ用: クロップした画像を保存
-            debug_path = f"/tmp/debug_crop_{int(x)}_{int(y)}_{int(width)}_{int(height)}.png"
-            cropped_image.save(debug_path)
-            logger.info(f"Debug: Cropped image saved to {debug_path}")
-            logger.info(f"Debug: Cropped image size: {cropped_image.size}")
+            # デバッグ用: クロップした画像を保存（PNGエンコード+書き込みのため有効時のみ）
+            if self.save_debug_crops:
+                debug_path = f"/tmp/debug_crop_{int(x)}_{int(y)}_{int(width)}_{int(height)}.png"
+                cropped_image.save(debug_path)
+                logger.debug("Debug: Cropped image saved to %s", debug_path)
+            logger.debug("Debug: Cropped image size: %s", cropped_image.size)
             
             # OCR実行 (EasyOCR優先、Tesseractフォールバック)
             ocr_text, confidence = self._perform_ocr_with_fallback(cropped_image)
@@ -171,42 +191,45 @@ class RegionOCRProcessor:
         Returns:
             Tuple[OCR結果テキスト, 信頼度スコア]
         """
+        # Tesseractは内部でグレースケール化するため、事前に8bitへ変換して転送量を削減
+        if image.mode != 'L':
+            image = image.convert('L')
+        
         if not self.tesseract_available:
             logger.warning("Tesseract not available, returning empty result")
             return "", 0.0
         
         try:
-            # 一時ファイルに画像を保存
-            with tempfile.NamedTemporaryFile(suffix='.png', delete=False) as temp_file:
-                image.save(temp_file.name, format='PNG')
-                temp_path = temp_file.name
+            # 画像をメモリ上でエンコードし、標準入力経由でTesseractに渡す（一時ファイル不要）
+            # 'L'モードは無圧縮PGM（P5）で書き出し、PNGの圧縮/展開を省略
+            buffer = io.BytesIO()
+            image.save(buffer, format='PPM')
+            image_bytes = buffer.getvalue()
             
-            try:
+            # テキスト認識と信頼度取得（TSV出力）は独立しているため並行実行
+            with ThreadPoolExecutor(max_workers=1) as executor:
+                confidence_future = executor.submit(self._get_confidence, image_bytes)
+                
                 # TesseractでOCR実行（日本語 + 英語）
                 result = subprocess.run([
                     'tesseract', 
-                    temp_path, 
+                    'stdin', 
                     'stdout', 
                     '-l', 'jpn+eng',
                     '--psm', '6',  # Uniform block of text
                     '-c', 'preserve_interword_spaces=1'
-                ], capture_output=True, text=True, timeout=30)
+                ], input=image_bytes, capture_output=True, timeout=30, env=_TESSERACT_ENV)
                 
-                if result.returncode == 0:
-                    ocr_text = result.stdout.strip()
-                    
-                    # 信頼度取得を試行（TSV出力）
-                    confidence = self._get_confidence(temp_path)
-                    
-                    logger.info(f"OCR result: '{ocr_text}' (confidence: {confidence})")
-                    return ocr_text, confidence
-                else:
-                    logger.error(f"Tesseract error: {result.stderr}")
-                    return "", 0.0
-                    
-            finally:
-                # 一時ファイル削除
-                Path(temp_path).unlink(missing_ok=True)
+                confidence = confidence_future.result()
+            
+            if result.returncode == 0:
+                ocr_text = result.stdout.decode('utf-8', errors='replace').strip()
+                
+                logger.debug("OCR result: %r (confidence: %s)", ocr_text, confidence)
+                return ocr_text, confidence
+            else:
+                logger.error(f"Tesseract error: {result.stderr.decode('utf-8', errors='replace')}")
+                return "", 0.0
                 
         except subprocess.TimeoutExpired:
             logger.error("OCR processing timeout")
@@ -215,44 +238,60 @@ class RegionOCRProcessor:
             logger.error(f"OCR processing error: {e}")
             return "", 0.0
     
-    def _get_confidence(self, image_path: str) -> float:
+    def _get_confidence(self, image_bytes: bytes) -> float:
         """
         OCR結果の信頼度スコアを取得
         
         Args:
-            image_path: 画像ファイルパス
+            image_bytes: エンコード済み画像データ（標準入力でTesseractに渡す）
             
         Returns:
             信頼度スコア（0-100）
         """
         try:
-            # TSV形式で詳細な結果を取得
-            result = subprocess.run([
+            # TSV形式で詳細な結果を取得（全出力をメモリに載せず行単位で集計）
+            with subprocess.Popen([
                 'tesseract', 
-                image_path, 
+                'stdin', 
                 'stdout', 
                 '-l', 'jpn+eng',
                 '--psm', '6',
                 'tsv'
-            ], capture_output=True, text=True, timeout=30)
-            
-            if result.returncode == 0:
-                lines = result.stdout.strip().split('\n')
-                confidences = []
+            ], stdin=subprocess.PIPE, stdout=subprocess.PIPE, stderr=subprocess.DEVNULL,
+               env=_TESSERACT_ENV) as process:
+                if process.stdin is None or process.stdout is None:
+                    return 0.0
                 
-                for line in lines[1:]:  # ヘッダーをスキップ
-                    fields = line.split('\t')
-                    if len(fields) >= 10 and fields[9]:  # confidenceフィールド
+                # タイムアウト時はプロセスを強制終了
+                timer = threading.Timer(30, process.kill)
+                timer.start()
+                try:
+                    # Tesseractは入力を読み切ってから出力するため、先に全て書き込む
+                    process.stdin.write(image_bytes)
+                    process.stdin.close()
+                    
+                    lines = io.TextIOWrapper(process.stdout, encoding='utf-8', errors='replace')
+                    header = lines.readline().rstrip('\n').split('\t')
+                    if 'conf' not in header:
+                        return 0.0
+                    conf_index = header.index('conf')
+                    
+                    confidence_sum = 0.0
+                    confidence_count = 0
+                    for line in lines:
+                        fields = line.split('\t')
                         try:
-                            conf = float(fields[9])
-                            if conf > 0:  # 有効な信頼度のみ
-                                confidences.append(conf)
+                            conf = float(fields[conf_index])
                         except (ValueError, IndexError):
                             continue
-                
-                if confidences:
-                    avg_confidence = sum(confidences) / len(confidences)
-                    return round(avg_confidence, 2)
+                        if conf > 0:  # 有効な信頼度のみ
+                            confidence_sum += conf
+                            confidence_count += 1
+                finally:
+                    timer.cancel()
+            
+            if process.returncode == 0 and confidence_count:
+                return round(confidence_sum / confidence_count, 2)
             
             return 0.0
             
@@ -273,10 +312,10 @@ class RegionOCRProcessor:
         # EasyOCRを試行
         if self.easyocr_reader is not None:
             try:
-                logger.info("Attempting OCR with EasyOCR")
+                logger.debug("Attempting OCR with EasyOCR")
                 ocr_text, confidence = self._perform_easyocr(image)
                 if ocr_text.strip():  # 結果が空でない場合
-                    logger.info(f"EasyOCR succeeded: '{ocr_text}' (confidence: {confidence})")
+                    logger.debug("EasyOCR succeeded: %r (confidence: %s)", ocr_text, confidence)
                     return ocr_text, confidence
                 else:
                     logger.warning("EasyOCR returned empty result, falling back to Tesseract")
@@ -284,7 +323,7 @@ class RegionOCRProcessor:
                 logger.error(f"EasyOCR failed: {e}, falling back to Tesseract")
         
         # Tesseractにフォールバック
-        logger.info("Using Tesseract OCR")
+        logger.debug("Using Tesseract OCR")
         return self._perform_ocr(image)
     
     def _perform_easyocr(self, image: Image.Image) -> Tuple[str, float]:
@@ -297,39 +336,50 @@ class RegionOCRProcessor:
         Returns:
             Tuple[OCR結果テキスト, 信頼度スコア]
         """
-        try:
-            # PIL ImageをNumPy配列に変換
-            image_np = np.array(image)
-            
-            # EasyOCRで処理
-            results = self.easyocr_reader.readtext(image_np)
-            
-            if not results:
-                return "", 0.0
-            
-            # 結果を統合
-            texts = []
-            confidences = []
-            
-            for (bbox, text, confidence) in results:
-                if text.strip() and confidence > 0.1:  # 低信頼度テキストを除外
-                    texts.append(text.strip())
-                    confidences.append(confidence)
-            
-            if not texts:
-                return "", 0.0
-            
-            # テキストを結合
-            combined_text = '\n'.join(texts)
-            
-            # 平均信頼度を計算
-            avg_confidence = sum(confidences) / len(confidences) if confidences else 0.0
-            confidence_percentage = round(avg_confidence * 100, 2)
-            
-            logger.info(f"EasyOCR found {len(texts)} text regions")
-            return combined_text, confidence_percentage
-            
-        except Exception as e:
-            logger.error(f"EasyOCR processing error: {e}")
-            raise
+        # PIL ImageをNumPy配列に変換
+        image_np = np.array(image)
+        
+        # EasyOCRで処理（検出したテキストボックスをまとめて認識）
+        results = self.easyocr_reader.readtext(image_np, batch_size=self.ocr_batch_size)
+        
+        if not results:
+            return "", 0.0
+        
+        # 結果を統合（信頼度は1パスで合計を集計）
+        texts = []
+        confidence_sum = 0.0
+        
+        for (bbox, text, confidence) in results:
+            stripped = text.strip()
+            if stripped and confidence > 0.1:  # 低信頼度テキストを除外
+                texts.append(stripped)
+                confidence_sum += confidence
+        
+        if not texts:
+            return "", 0.0
+        
+        # テキストを結合
+        combined_text = '\n'.join(texts)
+        
+        # 平均信頼度を計算
+        avg_confidence = confidence_sum / len(texts)
+        confidence_percentage = round(avg_confidence * 100, 2)
+        
+        logger.debug("EasyOCR found %d text regions", len(texts))
+        return combined_text, confidence_percentage
+
+
+@lru_cache(maxsize=1)
+def get_region_ocr_processor() -> RegionOCRProcessor:
+    """
+    RegionOCRProcessorのプロセス共有インスタンスを取得
+    
+    EasyOCRのモデル読み込みとTesseractの存在確認はコストが高いため、
+    リクエスト毎に生成せず初回のみ初期化して再利用する
+    """
+    from app.core.config import settings
     
+    return RegionOCRProcessor(
+        ocr_batch_size=settings.OCR_BATCH_SIZE,
+        save_debug_crops=settings.DEBUG,
+    )
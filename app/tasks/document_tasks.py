@@ -4,7 +4,6 @@ Note: Heavy document processing tasks are handled by celery-doc worker.
 This module only contains lightweight tasks that can run in api-doc.
 """
 import logging
-from pathlib import Path
 from typing import Optional
 import httpx
 
@@ -112,7 +111,7 @@ def ocr_region_task(
         document_id: Document identifier
         page_image_path: Path to the page image
         x, y, width, height: Region coordinates
-        language: OCR language
+        language: OCR language (currently unsupported; jpn+eng is always used)
         callback_url: Optional URL to notify on completion
 
     Returns:
@@ -121,16 +120,16 @@ def ocr_region_task(
     try:
         logger.info(f"Starting region OCR for document: {document_id}")
 
-        from app.services.processor import RegionOCRProcessor
+        from app.services.processor import get_region_ocr_processor
 
-        ocr_processor = RegionOCRProcessor()
-        result = ocr_processor.ocr_region(
-            Path(page_image_path),
+        ocr_processor = get_region_ocr_processor()
+        # language is not configurable yet; the processor always uses jpn+eng
+        result = ocr_processor.process_region_ocr(
+            image_path=str(page_image_path),
             x=x,
             y=y,
             width=width,
             height=height,
-            language=language,
         )
 
         response = {
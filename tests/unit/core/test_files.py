@@ -0,0 +1,41 @@
+"""Unit tests for app/core/files.py"""
+
+
+class TestSafeUploadFilename:
+    """Tests for safe_upload_filename function."""
+
+    def test_strips_parent_traversal(self):
+        """Should keep only the basename of a traversal path."""
+        from app.core.files import safe_upload_filename
+
+        assert safe_upload_filename("../../x") == "x"
+
+    def test_strips_directories(self):
+        """Should drop directory components."""
+        from app.core.files import safe_upload_filename
+
+        assert safe_upload_filename("a/b.pdf") == "b.pdf"
+
+    def test_dot_dot_uses_default(self):
+        """Should fall back to the default name for '..'."""
+        from app.core.files import safe_upload_filename
+
+        assert safe_upload_filename("..") == "document.pdf"
+
+    def test_none_uses_default(self):
+        """Should fall back to the default name when no filename is given."""
+        from app.core.files import safe_upload_filename
+
+        assert safe_upload_filename(None) == "document.pdf"
+
+    def test_keeps_non_ascii(self):
+        """Should preserve non-ASCII letters, spaces and parentheses."""
+        from app.core.files import safe_upload_filename
+
+        assert safe_upload_filename("報告書 (1).pdf") == "報告書 (1).pdf"
+
+    def test_replaces_unsafe_characters(self):
+        """Should replace characters outside the allowed set."""
+        from app.core.files import safe_upload_filename
+
+        assert safe_upload_filename("a:b*c.pdf") == "a_b_c.pdf"
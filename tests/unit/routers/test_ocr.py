@@ -0,0 +1,150 @@
+"""Unit tests for app/routers/ocr.py"""
+import json
+import threading
+from pathlib import Path
+from unittest.mock import patch
+
+import pytest
+from fastapi import HTTPException
+
+
+class TestWriteMetadataFile:
+    """Tests for write_metadata_file function."""
+
+    def test_writes_utf8_json(self, tmp_path):
+        """Should write non-ASCII text as UTF-8 without escaping."""
+        from app.routers.ocr import write_metadata_file
+
+        path = tmp_path / "metadata_hierarchy_edited.json"
+        write_metadata_file(path, {"title": "報告書", "pages": [1, 2]})
+
+        content = path.read_text(encoding="utf-8")
+        assert "報告書" in content
+        assert json.loads(content) == {"title": "報告書", "pages": [1, 2]}
+
+    def test_big_integer_falls_back_to_stdlib(self, tmp_path):
+        """Should write integers beyond 64 bits instead of raising."""
+        from app.routers.ocr import write_metadata_file
+
+        path = tmp_path / "metadata_hierarchy_edited.json"
+        write_metadata_file(path, {"id": 2**70})
+
+        assert json.loads(path.read_text(encoding="utf-8")) == {"id": 2**70}
+
+
+class TestReadMetadataFile:
+    """Tests for read_metadata_file function."""
+
+    def test_reads_utf8_json(self, tmp_path):
+        """Should parse UTF-8 JSON content."""
+        from app.routers.ocr import read_metadata_file
+
+        path = tmp_path / "metadata_hierarchy.json"
+        path.write_text('{"title": "報告書"}', encoding="utf-8")
+
+        assert read_metadata_file(path) == {"title": "報告書"}
+
+    def test_nan_falls_back_to_stdlib(self, tmp_path):
+        """Should parse NaN/Infinity written by the stdlib json module."""
+        import math
+
+        from app.routers.ocr import read_metadata_file
+
+        path = tmp_path / "metadata_hierarchy.json"
+        path.write_text(json.dumps({"score": float("nan"), "max": float("inf")}), encoding="utf-8")
+
+        result = read_metadata_file(path)
+
+        assert math.isnan(result["score"])
+        assert result["max"] == float("inf")
+
+
+class TestGetImage:
+    """Tests for get_image endpoint."""
+
+    @pytest.mark.asyncio
+    @pytest.mark.parametrize("path", ["../x", "figures/../../x", "/etc/passwd"])
+    @patch("app.routers.ocr.resolve_document_path")
+    async def test_rejects_escaping_path_before_resolving(self, mock_resolve, path):
+        """Should return 403 for absolute or '..' paths without resolving the document."""
+        from app.routers.ocr import get_image
+
+        with pytest.raises(HTTPException) as exc_info:
+            await get_image("doc-1", path, processing_path=None, current_user={})
+
+        assert exc_info.value.status_code == 403
+        mock_resolve.assert_not_called()
+
+
+class _FakeMinioClient:
+    """In-memory stand-in for MinioClient used by _resolve_minio_path."""
+
+    def __init__(self, keys, fail_key=None):
+        self.keys = keys
+        self.fail_key = fail_key
+        self.downloaded = {}
+        self._lock = threading.Lock()
+
+    def list_objects(self, bucket, prefix):
+        return [{"Key": key} for key in self.keys]
+
+    def download_file(self, bucket, object_key, file_path):
+        if object_key == self.fail_key:
+            raise RuntimeError("download failed")
+        Path(file_path).write_bytes(object_key.encode("utf-8"))
+        with self._lock:
+            self.downloaded[object_key] = file_path
+        return file_path
+
+
+class TestResolveMinioPath:
+    """Tests for _resolve_minio_path function."""
+
+    KEYS = [
+        "doc-1/output/",
+        "doc-1/output/page_1.png",
+        "doc-1/output/figures/fig_1.png",
+        "doc-1/output/metadata_hierarchy.json",
+    ]
+
+    @pytest.fixture(autouse=True)
+    def empty_cache(self):
+        with patch.dict("app.routers.ocr._minio_cache", clear=True):
+            yield
+
+    def test_downloads_every_object_under_temp_dir(self, tmp_path):
+        """Should download each listed key to temp_dir/<relative path> and cache the dir."""
+        from app.routers import ocr
+
+        client = _FakeMinioClient(self.KEYS)
+        temp_dir = tmp_path / "download"
+        temp_dir.mkdir()
+
+        with patch("app.services.storage.get_minio_client", return_value=client), \
+                patch("app.routers.ocr.tempfile.mkdtemp", return_value=str(temp_dir)):
+            result = ocr._resolve_minio_path("doc-1", "minio://documents/doc-1/output")
+
+        assert result == temp_dir
+        assert client.downloaded == {
+            "doc-1/output/page_1.png": str(temp_dir / "page_1.png"),
+            "doc-1/output/figures/fig_1.png": str(temp_dir / "figures" / "fig_1.png"),
+            "doc-1/output/metadata_hierarchy.json": str(temp_dir / "metadata_hierarchy.json"),
+        }
+        assert (temp_dir / "figures" / "fig_1.png").read_bytes() == b"doc-1/output/figures/fig_1.png"
+        assert ocr._minio_cache == {"doc-1:minio://documents/doc-1/output": temp_dir}
+
+    def test_failed_download_falls_back_without_caching(self, tmp_path):
+        """Should return the local storage path and not cache the temp dir when a download fails."""
+        from app.core.config import settings
+        from app.routers import ocr
+
+        client = _FakeMinioClient(self.KEYS, fail_key="doc-1/output/figures/fig_1.png")
+        temp_dir = tmp_path / "download"
+        temp_dir.mkdir()
+
+        with patch("app.services.storage.get_minio_client", return_value=client), \
+                patch("app.routers.ocr.tempfile.mkdtemp", return_value=str(temp_dir)):
+            result = ocr._resolve_minio_path("doc-1", "minio://documents/doc-1/output")
+
+        assert result == Path(settings.STORAGE_BASE_PATH) / "doc-1"
+        assert ocr._minio_cache == {}
@@ -0,0 +1,111 @@
+"""Unit tests for app/routers/process.py"""
+import json
+from unittest.mock import AsyncMock, MagicMock, patch
+
+import pytest
+
+
+def _fake_celery_module(task_metas):
+    """Build a stand-in app.tasks.celery_app module whose backend returns task_metas in order."""
+    celery_app = MagicMock()
+    celery_app.backend.get_task_meta.side_effect = task_metas
+    return MagicMock(celery_app=celery_app)
+
+
+async def _collect_events(task_metas, monotonic_values):
+    """Run stream_task_status against a fake backend and return (parsed events, get_task_meta mock)."""
+    from app.routers.process import stream_task_status
+
+    module = _fake_celery_module(task_metas)
+    with patch.dict("sys.modules", {"app.tasks.celery_app": module}), \
+            patch("app.routers.process.asyncio.sleep", new=AsyncMock()), \
+            patch("app.routers.process.time") as mock_time:
+        mock_time.monotonic.side_effect = monotonic_values
+        response = await stream_task_status("task-1", current_user={})
+        chunks = [chunk async for chunk in response.body_iterator]
+
+    events = []
+    for chunk in chunks:
+        assert chunk.startswith("data: ") and chunk.endswith("\n\n")
+        events.append(json.loads(chunk[len("data: "):]))
+    return events, module.celery_app.backend.get_task_meta
+
+
+class TestDumpsEvent:
+    """Tests for _dumps_event function."""
+
+    def test_serializes_payload(self):
+        """Should serialize a regular event payload."""
+        from app.routers.process import _dumps_event
+
+        payload = {"status": "PROGRESS", "progress": 50, "message": "処理中"}
+
+        assert json.loads(_dumps_event(payload)) == payload
+
+    def test_big_integer_falls_back_to_stdlib(self):
+        """Should serialize integers beyond 64 bits instead of raising."""
+        from app.routers.process import _dumps_event
+
+        assert json.loads(_dumps_event({"n": 2**70})) == {"n": 2**70}
+
+    def test_non_str_key_falls_back_to_stdlib(self):
+        """Should serialize non-str dict keys the way json.dumps does."""
+        from app.routers.process import _dumps_event
+
+        assert json.loads(_dumps_event({1: "x"})) == {"1": "x"}
+
+
+class TestStreamTaskStatus:
+    """Tests for stream_task_status SSE endpoint."""
+
+    @pytest.mark.asyncio
+    async def test_streams_state_changes_until_success(self):
+        """Should emit an event per status change with info/result and stop on SUCCESS."""
+        task_metas = [
+            {"status": "PENDING", "result": None},
+            {"status": "PROGRESS", "result": {"progress": 50}},
+            {"status": "PROGRESS", "result": {"progress": 60}},
+            {"status": "SUCCESS", "result": {"pages": 3}},
+        ]
+
+        events, get_task_meta = await _collect_events(task_metas, [0.0, 0.0, 0.5, 1.0, 1.5])
+
+        assert [e["status"] for e in events] == ["PENDING", "PROGRESS", "SUCCESS"]
+        assert all(e["task_id"] == "task-1" for e in events)
+        assert "info" not in events[0] and "result" not in events[0]
+        assert events[1]["info"] == {"progress": 50}
+        assert "result" not in events[1]
+        assert events[2]["result"] == {"pages": 3}
+        assert events[2]["info"] == {"pages": 3}
+        assert get_task_meta.call_count == 4
+        get_task_meta.assert_called_with("task-1")
+
+    @pytest.mark.asyncio
+    async def test_stops_on_failure(self):
+        """Should emit the terminal event and end the stream on FAILURE."""
+        task_metas = [
+            {"status": "FAILURE", "result": "boom"},
+            {"status": "PENDING", "result": None},
+        ]
+
+        events, get_task_meta = await _collect_events(task_metas, [0.0, 0.0])
+
+        assert len(events) == 1
+        assert events[0]["status"] == "FAILURE"
+        assert events[0]["result"] == "boom"
+        assert get_task_meta.call_count == 1
+
+    @pytest.mark.asyncio
+    async def test_heartbeat_for_unchanged_status(self):
+        """Should re-emit an unchanged status once the heartbeat interval has passed."""
+        task_metas = [
+            {"status": "STARTED", "result": None},
+            {"status": "STARTED", "result": None},
+            {"status": "STARTED", "result": None},
+            {"status": "SUCCESS", "result": None},
+        ]
+
+        events, _ = await _collect_events(task_metas, [0.0, 0.0, 1.0, 2.5, 3.0])
+
+        assert [e["status"] for e in events] == ["STARTED", "STARTED", "SUCCESS"]
+        assert events[-1]["result"] is None
@@ -0,0 +1,24 @@
+"""Unit tests for app/services/processor/image_cropper.py"""
+
+
+class TestCropFigureElements:
+    """Tests for ImageCropper.crop_figure_elements."""
+
+    def test_missing_page_image_reports_each_figure(self, tmp_path):
+        """Should return a failure result per figure when the page image is missing."""
+        from app.services.processor.image_cropper import ImageCropper
+
+        figures = [
+            {"id": "fig-1", "bbox": {"x1": 0, "y1": 0, "x2": 10, "y2": 10}},
+            {"id": "fig-2", "x": 0, "y": 0, "width": 10, "height": 10},
+        ]
+
+        result = ImageCropper().crop_figure_elements(
+            str(tmp_path / "missing.png"), figures, str(tmp_path)
+        )
+
+        assert result["total_figures"] == 2
+        assert result["success_count"] == 0
+        assert result["failed_count"] == 2
+        assert len(result["results"]) == 2
+        assert all(not r["success"] for r in result["results"])
@@ -0,0 +1,77 @@
+"""Unit tests for app/services/processor/region_ocr_processor.py"""
+import io
+from unittest.mock import MagicMock, patch
+
+import pytest
+
+TSV_HEADER = "level\tpage_num\tblock_num\tpar_num\tline_num\tword_num\tleft\ttop\twidth\theight\tconf\ttext\n"
+
+
+def _make_process(stdout: bytes, returncode: int = 0) -> MagicMock:
+    """Build a Popen mock whose context manager yields a process with the given output."""
+    process = MagicMock()
+    process.stdin = MagicMock()
+    process.stdout = io.BytesIO(stdout)
+    process.returncode = returncode
+
+    popen = MagicMock()
+    popen.return_value.__enter__.return_value = process
+    popen.return_value.__exit__.return_value = False
+    return popen
+
+
+@pytest.fixture
+def processor():
+    """RegionOCRProcessor without running Tesseract/EasyOCR initialization."""
+    from app.services.processor.region_ocr_processor import RegionOCRProcessor
+
+    return RegionOCRProcessor.__new__(RegionOCRProcessor)
+
+
+class TestGetConfidence:
+    """Tests for RegionOCRProcessor._get_confidence."""
+
+    def test_averages_conf_column_only(self, processor):
+        """Should average the positive values of the conf column, not other columns."""
+        tsv = (
+            TSV_HEADER
+            + "1\t1\t0\t0\t0\t0\t0\t0\t200\t100\t-1\t\n"
+            + "5\t1\t1\t1\t1\t1\t10\t10\t50\t20\t90\tHello\n"
+            + "5\t1\t1\t1\t1\t2\t70\t10\t50\t30\t80\tWorld\n"
+        )
+        popen = _make_process(tsv.encode("utf-8"))
+
+        with patch("app.services.processor.region_ocr_processor.subprocess.Popen", popen):
+            result = processor._get_confidence(b"image")
+
+        assert result == 85.0
+        popen.return_value.__enter__.return_value.stdin.write.assert_called_once_with(b"image")
+
+    def test_missing_conf_header(self, processor):
+        """Should return 0.0 when the output has no conf column."""
+        popen = _make_process(b"level\ttext\n5\tHello\n")
+
+        with patch("app.services.processor.region_ocr_processor.subprocess.Popen", popen):
+            result = processor._get_confidence(b"image")
+
+        assert result == 0.0
+
+    def test_nonzero_returncode(self, processor):
+        """Should return 0.0 when tesseract exits with an error."""
+        tsv = TSV_HEADER + "5\t1\t1\t1\t1\t1\t10\t10\t50\t20\t90\tHello\n"
+        popen = _make_process(tsv.encode("utf-8"), returncode=1)
+
+        with patch("app.services.processor.region_ocr_processor.subprocess.Popen", popen):
+            result = processor._get_confidence(b"image")
+
+        assert result == 0.0
+
+    def test_missing_pipes(self, processor):
+        """Should return 0.0 when the process has no stdin/stdout pipes."""
+        popen = _make_process(b"")
+        popen.return_value.__enter__.return_value.stdin = None
+
+        with patch("app.services.processor.region_ocr_processor.subprocess.Popen", popen):
+            result = processor._get_confidence(b"image")
+
+        assert result == 0.0